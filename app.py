@@ -1,15 +1,31 @@
 import os
 import re
-import uuid
 import time
+import secrets
+import hashlib
+import threading
+import unicodedata
+from collections import Counter
 
 import fitz
+import orjson
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 from groq import Groq
 from dotenv import load_dotenv
+from sqlalchemy import event, func, select, text as sql_text, update
 
-from models import db, Quiz, Question, Student
+from models import db, Quiz, Question, Student, LLMCache, SemanticCache, OPTIONS_SEP
+
+# Semantic cache for near-duplicate inputs; disabled if fastembed is missing
+try:
+    import numpy as np
+    from fastembed import TextEmbedding
+except ImportError:
+    np = None
+    TextEmbedding = None
 
 # ------------------ SETUP ------------------
 load_dotenv()
@@ -17,34 +33,249 @@ load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 client = Groq(api_key=GROQ_API_KEY)
 
+LLM_MODEL = "llama-3.1-8b-instant"
+LLM_TEMPERATURE = 0.3
+LLM_SYSTEM_PROMPT = "You generate MCQs"
+
+LLM_CACHE_TTL = 7 * 24 * 3600   # seconds
+LLM_CACHE_MAX_ROWS = 1000
+
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.95   # cosine similarity, required in every window
+# The source is embedded as evenly spaced windows across the whole text, each
+# within MiniLM's 256-token limit, so documents sharing only a preamble
+# (e.g. the same exam instructions) do not match.
+SEMANTIC_CACHE_WINDOWS = 4
+SEMANTIC_CACHE_WINDOW_CHARS = 800
+SEMANTIC_CACHE_TTL = LLM_CACHE_TTL
+SEMANTIC_CACHE_MAX_ROWS = 10000
+
+INSERT_CHUNK_SIZE = 500
+
+# ASCII-sorted so string order of ids matches creation order
+BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+# Precompiled patterns for PDF cleanup and MCQ parsing
+_WS = re.compile(r"\s+")
+_PAGE_NUM = re.compile(r"^\s*\d+\s*$")
+
+# Header/footer candidates: short lines near the top or bottom of a page
+# that repeat on more than BOILERPLATE_PAGE_RATIO of the pages read
+BOILERPLATE_PAGE_RATIO = 0.3
+BOILERPLATE_HEAD_LINES = 8
+BOILERPLATE_FOOT_LINES = 3
+BOILERPLATE_MIN_LINE = 8     # chars; shorter lines ("Ans", "2M", "a") are content
+BOILERPLATE_MAX_LINE = 100   # chars; longer repeated lines are kept as content
+
+# One MCQ per match, so the LLM output is scanned in a single left-to-right pass.
+# The question runs up to the "A." line, so it may start on the next line
+# after "Q1:" or wrap over several lines. The explanation may follow the
+# answer on the same line.
+_MCQ = re.compile(
+    r"Q\d+:\s*(?P<q>(?:(?!\r?\n[ \t]*(?:Q\d+:|A\.))[\s\S])*)\r?\n\s*"
+    r"A\.[ \t]*(?P<a>[^\r\n]*)\r?\n\s*"
+    r"B\.[ \t]*(?P<b>[^\r\n]*)\r?\n\s*"
+    r"C\.[ \t]*(?P<c>[^\r\n]*)\r?\n\s*"
+    r"D\.[ \t]*(?P<d>[^\r\n]*)\r?\n\s*"
+    r"(?:[E-Z]\.[^\r\n]*\r?\n\s*)*"   # extra options are ignored
+    r"Answer:\s*(?P<ans>[ABCD])"
+    r"(?:[^\r\n]*?(?:\r?\n\s*)?Explanation:[ \t]*(?P<exp>[^\r\n]*))?"
+)
+
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
+class OrjsonProvider(JSONProvider):
+    """
+    jsonify() backed by orjson: serializes straight to bytes
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # ✅ PROPER CORS
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(BASE_DIR, "quiz.db")
+# br/gzip for larger JSON bodies (e.g. submit_quiz results)
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 500
+Compress(app)
+
+DB_PATH = os.getenv("QUIZ_DB_PATH", os.path.join(BASE_DIR, "quiz.db"))
+app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + DB_PATH
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Long-lived pooled connections, one per gunicorn thread (gunicorn.conf.py
+# exports GUNICORN_THREADS; 5 is SQLAlchemy's default for other servers), so
+# requests never pay for a fresh sqlite connect + PRAGMA replay. Overflow is
+# uncapped so servers with unbounded threads (the Flask dev server) never
+# wait on the pool. Not StaticPool: a single shared connection would
+# interleave transactions from concurrent threads.
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    "pool_size": int(os.getenv("GUNICORN_THREADS", "5")),
+    "max_overflow": -1,
+    "connect_args": {"check_same_thread": False},
+}
 
 db.init_app(app)
 
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",       # ~20 MB page cache
+    "PRAGMA mmap_size=268435456",     # 256 MB
+)
+
+
+def apply_sqlite_pragmas(dbapi_conn, _record):
+    cur = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cur.execute(pragma)
+    cur.close()
+
+
+def migrate_json_options():
+    """
+    One-off: rewrite options stored by the old JSON column as OPTIONS_SEP text.
+    Idempotent, so every worker can run it at startup.
+    """
+    rows = db.session.execute(
+        select(Question.id, Question.options).where(Question.options.like("[%"))
+    ).all()
+
+    fixed = []
+    for r in rows:
+        try:
+            options = orjson.loads(r.options)
+        except orjson.JSONDecodeError:
+            continue    # new-format value whose first option starts with "["
+        if isinstance(options, list) and all(isinstance(o, str) for o in options):
+            fixed.append({"id": r.id, "options": OPTIONS_SEP.join(options)})
+
+    if fixed:
+        db.session.execute(update(Question), fixed)
+        db.session.commit()
+        print(f"💾 Migrated options of {len(fixed)} questions")
+
+
+def migrate_indexes():
+    """
+    create_all skips tables that already exist, along with their indexes,
+    so add the quiz_id lookup indexes to databases created before them
+    """
+    for index in (*Question.__table__.indexes, *Student.__table__.indexes):
+        index.create(db.engine, checkfirst=True)
+
+
+def migrate_semantic_cache():
+    """
+    semantic_cache tables created before ids were AUTOINCREMENT can reuse ids,
+    which the per-worker matrix relies on never happening. It is only a
+    cache, so drop and recreate it.
+    """
+    table_sql = db.session.execute(
+        sql_text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'semantic_cache'")
+    ).scalar()
+    if table_sql and "AUTOINCREMENT" not in table_sql.upper():
+        SemanticCache.__table__.drop(db.engine)
+        SemanticCache.__table__.create(db.engine)
+        print("💾 Recreated semantic_cache")
+
+
 with app.app_context():
+    # every pooled connection (including the one create_all uses) gets the PRAGMAs
+    event.listen(db.engine, "connect", apply_sqlite_pragmas)
     db.create_all()
+    migrate_json_options()
+    migrate_indexes()
+    migrate_semantic_cache()
 
 # ------------------ HELPERS ------------------
 
-def extract_text_from_pdf(path, max_chars=8000):
-    doc = fitz.open(path)
-    text = " ".join(page.get_text("text") for page in doc)
-    return re.sub(r"\s+", " ", text).strip()[:max_chars]
+def extract_text_from_pdf(pdf_bytes, max_chars=8000):
+    parts = []
+    total = 0
+
+    # Pages are read serially on purpose: PyMuPDF is not thread-safe and
+    # holds the GIL, and the early exit below only touches a few pages anyway.
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            page_text = page.get_text("text")
+            parts.append(page_text)
+            total += len(page_text)
+            # 2x headroom for whitespace collapse
+            if total > max_chars * 2:
+                break
+
+    text = strip_pdf_boilerplate(parts)
+    return _WS.sub(" ", text).strip()[:max_chars]
+
+
+def _edge_indexes(lines):
+    n = len(lines)
+    head = range(min(BOILERPLATE_HEAD_LINES, n))
+    foot = range(max(n - BOILERPLATE_FOOT_LINES, 0), n)
+    return set(head) | set(foot)
+
+
+def strip_pdf_boilerplate(pages):
+    """
+    Drop page numbers and lines repeated across pages (headers/footers),
+    looking only at the first and last few lines of each page
+    """
+    page_lines = [[line.strip() for line in p.splitlines() if line.strip()] for p in pages]
+
+    # only meaningful once there are enough pages to see a repeat
+    repeated = set()
+    if len(pages) >= 3:
+        freq = Counter(
+            line
+            for lines in page_lines
+            for line in {lines[i] for i in _edge_indexes(lines)}
+            if BOILERPLATE_MIN_LINE <= len(line) <= BOILERPLATE_MAX_LINE
+        )
+        limit = len(pages) * BOILERPLATE_PAGE_RATIO
+        repeated = {line for line, n in freq.items() if n > 1 and n > limit}
+
+    kept = []
+    for lines in page_lines:
+        edges = _edge_indexes(lines)
+        kept.extend(
+            line
+            for i, line in enumerate(lines)
+            if i not in edges or not (line in repeated or _PAGE_NUM.match(line))
+        )
+    return "\n".join(kept)
+
+
+def new_quiz_id():
+    """
+    10-char base62 id: 7 chars of ms timestamp (good until ~2081) + 3 random.
+    Ids sort by creation time, so quiz.id inserts append to the B-tree.
+    """
+    ms = time.time_ns() // 1_000_000
+    stamp = ""
+    for _ in range(7):
+        ms, r = divmod(ms, 62)
+        stamp = BASE62[r] + stamp
+    return stamp + "".join(secrets.choice(BASE62) for _ in range(3))
 
 
 def build_prompt(src_text, num_q):
+    # static instructions first, per-request text last, so every call
+    # shares the same prompt prefix for provider-side prompt caching
     return f"""
-Generate exactly {num_q} multiple-choice questions.
-
-Format:
+Output format:
 Q1: Question
 A. option
 B. option
@@ -55,9 +286,66 @@ Explanation: reason
 
 Text:
 \"\"\"{src_text}\"\"\"
+
+Generate exactly {num_q} multiple-choice questions from the text above.
 """.strip()
 
 
+def llm_cache_key(prompt):
+    prompt = unicodedata.normalize("NFC", prompt).strip()
+    raw = f"{LLM_MODEL}|{LLM_TEMPERATURE}|{LLM_SYSTEM_PROMPT}|{prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def llm_cache_get(key):
+    """
+    Cached LLM response for this key, or None (cache errors count as a miss)
+    """
+    try:
+        entry = db.session.get(LLMCache, key)
+        if not entry:
+            return None
+
+        now = time.time()
+        if now - entry.created_at > LLM_CACHE_TTL:
+            db.session.delete(entry)
+            db.session.commit()
+            return None
+
+        entry.last_used = now
+        db.session.commit()
+        return entry.response
+    except Exception as e:
+        db.session.rollback()
+        print("⚠️ LLM cache read failed:", e)
+        return None
+
+
+def llm_cache_put(key, response):
+    """
+    Store a response that parsed into questions; failures are only logged
+    """
+    try:
+        now = time.time()
+        db.session.merge(LLMCache(key=key, response=response, created_at=now, last_used=now))
+        db.session.commit()
+
+        # LRU eviction once the cache grows past its cap
+        overflow = LLMCache.query.count() - LLM_CACHE_MAX_ROWS
+        if overflow > 0:
+            stale = (
+                LLMCache.query.order_by(LLMCache.last_used.asc())
+                .limit(overflow)
+                .all()
+            )
+            for entry in stale:
+                db.session.delete(entry)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print("⚠️ LLM cache write failed:", e)
+
+
 def call_llm(prompt, timeout_sec=40):
     """
     Groq API call with HARD TIME LIMIT
@@ -66,10 +354,10 @@ def call_llm(prompt, timeout_sec=40):
 
     try:
         resp = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            temperature=0.3,
+            model=LLM_MODEL,
+            temperature=LLM_TEMPERATURE,
             messages=[
-                {"role": "system", "content": "You generate MCQs"},
+                {"role": "system", "content": LLM_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
         )
@@ -86,27 +374,206 @@ def call_llm(prompt, timeout_sec=40):
     return resp.choices[0].message.content
 
 
-def parse_mcqs(text):
-    blocks = re.split(r"\n?(?=Q\d+:)", text)
-    mcqs = []
-
-    for b in blocks:
-        q = re.search(r"Q\d+:\s*(.*)", b)
-        opts = re.findall(r"\n([ABCD])\.\s*(.*)", b)
-        ans = re.search(r"Answer:\s*([ABCD])", b)
-        exp = re.search(r"Explanation:\s*(.*)", b)
-
-        if not q or len(opts) != 4 or not ans:
-            continue
-
-        mcqs.append({
-            "q": q.group(1).strip(),
-            "options": [o[1].strip() for o in opts],
-            "answer_letter": ans.group(1),
-            "explanation": exp.group(1).strip() if exp else ""
-        })
+# In-process copy of the semantic_cache embeddings, topped up from the DB
+# (rows with id > last_id) so entries written by other workers are seen too.
+# "synced" counts the rows with id <= last_id that existed at the last sync,
+# including ones skipped for a dimension mismatch; a lower live count means
+# some were evicted.
+_semantic_lock = threading.Lock()
+_semantic = {
+    "embedder": None, "loader": None,
+    "last_id": 0, "synced": 0, "ids": [], "num_q": [], "matrix": None
+}
+
+
+def _load_embedder():
+    # runs once per process in a background thread, started by the first
+    # semantic_embed call: the load may download the model, which must not
+    # happen inside a request or on import
+    try:
+        _semantic["embedder"] = TextEmbedding(model_name=SEMANTIC_CACHE_MODEL)
+        print("✅ Semantic cache model loaded")
+    except Exception as e:
+        print("⚠️ Semantic cache disabled, model failed to load:", e)
 
-    return mcqs
+
+def _semantic_windows(src_text):
+    n, size = len(src_text), SEMANTIC_CACHE_WINDOW_CHARS
+    if n <= size:
+        return [src_text] * SEMANTIC_CACHE_WINDOWS
+    step = (n - size) / (SEMANTIC_CACHE_WINDOWS - 1)
+    starts = [round(i * step) for i in range(SEMANTIC_CACHE_WINDOWS)]
+    return [src_text[start:start + size] for start in starts]
+
+
+def semantic_embed(src_text):
+    """
+    Concatenated L2-normalized embeddings of the source text's windows,
+    or None if unavailable
+    """
+    if TextEmbedding is None:
+        return None
+
+    embedder = _semantic["embedder"]
+    if embedder is None:
+        with _semantic_lock:
+            if _semantic["loader"] is None:
+                _semantic["loader"] = threading.Thread(target=_load_embedder, daemon=True)
+                _semantic["loader"].start()
+        return None
+
+    try:
+        vecs = np.stack([
+            np.asarray(v, dtype=np.float32)
+            for v in embedder.embed(_semantic_windows(src_text))
+        ])
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        return (vecs / np.where(norms == 0, 1.0, norms)).ravel()
+    except Exception as e:
+        print("⚠️ Semantic embed failed:", e)
+        return None
+
+
+def _semantic_refresh(dim):
+    if _semantic["matrix"] is not None and _semantic["matrix"].shape[1] != dim:
+        # embedding model changed: rebuild from the rows that match it
+        _semantic.update(last_id=0, synced=0, ids=[], num_q=[], matrix=None)
+
+    # drop rows evicted since the last refresh (by any worker)
+    if _semantic["last_id"]:
+        live = (
+            db.session.query(func.count(SemanticCache.id))
+            .filter(SemanticCache.id <= _semantic["last_id"])
+            .scalar()
+        )
+        if live != _semantic["synced"]:
+            keep = {
+                r.id for r in db.session.query(SemanticCache.id)
+                .filter(SemanticCache.id <= _semantic["last_id"])
+            }
+            mask = np.array([i in keep for i in _semantic["ids"]], dtype=bool)
+            if _semantic["ids"]:
+                _semantic["matrix"] = _semantic["matrix"][mask] if mask.any() else None
+            _semantic["ids"] = [i for i, k in zip(_semantic["ids"], mask) if k]
+            _semantic["num_q"] = [n for n, k in zip(_semantic["num_q"], mask) if k]
+            _semantic["synced"] = len(keep)
+
+    rows = (
+        db.session.query(SemanticCache.id, SemanticCache.num_q, SemanticCache.embedding)
+        .filter(SemanticCache.id > _semantic["last_id"])
+        .order_by(SemanticCache.id)
+        .all()
+    )
+    if not rows:
+        return
+
+    _semantic["last_id"] = rows[-1].id
+    _semantic["synced"] += len(rows)
+    # skip rows embedded by a different model (dimension mismatch)
+    rows = [r for r in rows if len(r.embedding) == dim * 4]
+    if not rows:
+        return
+
+    new = np.stack([np.frombuffer(r.embedding, dtype=np.float32) for r in rows])
+    old = _semantic["matrix"]
+    _semantic["matrix"] = new if old is None else np.vstack([old, new])
+    _semantic["ids"].extend(r.id for r in rows)
+    _semantic["num_q"].extend(r.num_q for r in rows)
+
+
+def semantic_cache_get(query, num_q):
+    """
+    Return a cached LLM response for near-identical source text, else None
+    """
+    if query is None:
+        return None
+
+    try:
+        with _semantic_lock:
+            _semantic_refresh(query.shape[0])
+            if _semantic["matrix"] is None:
+                return None
+            # cosine per window, then the weakest window decides
+            n = len(_semantic["ids"])
+            windows = _semantic["matrix"].reshape(n, SEMANTIC_CACHE_WINDOWS, -1)
+            per_window = np.einsum(
+                "nwd,wd->nw", windows, query.reshape(SEMANTIC_CACHE_WINDOWS, -1)
+            )
+            scores = per_window.min(axis=1)
+            scores[np.asarray(_semantic["num_q"]) != num_q] = -1.0
+            best = int(scores.argmax())
+            if scores[best] < SEMANTIC_CACHE_THRESHOLD:
+                return None
+            entry_id = _semantic["ids"][best]
+
+        entry = db.session.get(SemanticCache, entry_id)
+        if not entry:
+            return None
+
+        now = time.time()
+        if now - entry.created_at > SEMANTIC_CACHE_TTL:
+            db.session.delete(entry)
+            db.session.commit()
+            return None
+
+        entry.last_used = now
+        db.session.commit()
+        return entry.response
+    except Exception as e:
+        db.session.rollback()
+        print("⚠️ Semantic cache read failed:", e)
+        return None
+
+
+def semantic_cache_put(query, num_q, response):
+    if query is None:
+        return
+
+    try:
+        now = time.time()
+        db.session.add(SemanticCache(
+            num_q=num_q,
+            embedding=query.tobytes(),
+            response=response,
+            created_at=now,
+            last_used=now
+        ))
+
+        # TTL expiry, then LRU eviction once the cache grows past its cap
+        SemanticCache.query.filter(
+            SemanticCache.created_at < now - SEMANTIC_CACHE_TTL
+        ).delete(synchronize_session=False)
+        db.session.flush()
+        overflow = SemanticCache.query.count() - SEMANTIC_CACHE_MAX_ROWS
+        if overflow > 0:
+            stale = (
+                db.session.query(SemanticCache.id)
+                .order_by(SemanticCache.last_used.asc())
+                .limit(overflow)
+            )
+            SemanticCache.query.filter(
+                SemanticCache.id.in_(stale.scalar_subquery())
+            ).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print("⚠️ Semantic cache write failed:", e)
+
+
+def parse_mcqs(text):
+    # every MCQ match needs "Answer:", so refusals/errors skip the regex entirely
+    if "Answer:" not in text:
+        return []
+
+    return [
+        {
+            "q": _WS.sub(" ", m["q"]).strip(),
+            "options": [m[k].strip() for k in ("a", "b", "c", "d")],
+            "answer_letter": m["ans"],
+            "explanation": (m["exp"] or "").strip()
+        }
+        for m in _MCQ.finditer(text)
+    ]
 
 # ------------------ ROUTES ------------------
 
@@ -121,10 +588,7 @@ def generate():
 
     if file:
         print("📄 PDF received")
-        os.makedirs("uploads", exist_ok=True)
-        path = os.path.join("uploads", file.filename)
-        file.save(path)
-        text = extract_text_from_pdf(path)
+        text = extract_text_from_pdf(file.read())
     elif paragraph:
         print("📝 Paragraph received")
         text = paragraph
@@ -132,9 +596,25 @@ def generate():
         return jsonify({"error": "Input required"}), 400
 
     try:
-        print("🤖 Calling Groq...")
-        raw = call_llm(build_prompt(text, num_q))
-        print("✅ Groq finished")
+        prompt = build_prompt(text, num_q)
+        cache_key = llm_cache_key(prompt)
+        embedding = None
+
+        raw = llm_cache_get(cache_key)
+        if raw is not None:
+            print("⚡ LLM cache hit")
+            fresh = False
+        else:
+            embedding = semantic_embed(text)
+            raw = semantic_cache_get(embedding, num_q)
+            if raw is not None:
+                print("⚡ Semantic cache hit")
+                fresh = False
+            else:
+                print("🤖 Calling Groq...")
+                raw = call_llm(prompt)
+                print("✅ Groq finished")
+                fresh = True
 
         questions = parse_mcqs(raw)
         print(f"❓ Parsed {len(questions)} questions")
@@ -142,22 +622,34 @@ def generate():
         if not questions:
             return jsonify({"error": "Failed to generate questions"}), 500
 
+        # only cache replies that actually produced questions, so a refusal
+        # or malformed reply is not replayed on every retry
+        if fresh:
+            llm_cache_put(cache_key, raw)
+            semantic_cache_put(embedding, num_q, raw)
+
     except Exception as e:
         print("❌ Generation failed:", e)
         return jsonify({"error": "AI generation failed. Try again."}), 500
 
-    quiz_id = str(uuid.uuid4())[:8]
+    quiz_id = new_quiz_id()
     quiz = Quiz(id=quiz_id, time=quiz_time)
     db.session.add(quiz)
-
-    for q in questions:
-        db.session.add(Question(
-            quiz_id=quiz_id,
-            question=q["q"],
-            options=q["options"],
-            answer_letter=q["answer_letter"],
-            explanation=q["explanation"]
-        ))
+    db.session.flush()  # quiz row must exist before the bulk question insert
+
+    rows = [
+        {
+            "quiz_id": quiz_id,
+            "question": q["q"],
+            "options": OPTIONS_SEP.join(q["options"]),
+            "answer_letter": q["answer_letter"],
+            "explanation": q["explanation"]
+        }
+        for q in questions
+    ]
+    # chunk to stay under SQLite's bound-parameter limit
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.bulk_insert_mappings(Question, rows[i:i + INSERT_CHUNK_SIZE])
 
     db.session.commit()
     print("💾 Quiz saved")
@@ -171,18 +663,23 @@ def generate():
 
 @app.route("/api/quiz/<quiz_id>", methods=["GET"])
 def get_quiz(quiz_id):
-    quiz = Quiz.query.get(quiz_id)
-    if not quiz:
+    # one round trip: quiz row LEFT JOIN its questions
+    rows = db.session.execute(
+        select(Quiz.time, Question.question, Question.options)
+        .outerjoin(Question, Question.quiz_id == Quiz.id)
+        .where(Quiz.id == quiz_id)
+        .order_by(Question.id)
+    ).all()
+    if not rows:
         return jsonify({"error": "Quiz not found"}), 404
 
-    questions = Question.query.filter_by(quiz_id=quiz_id).all()
-
     return jsonify({
         "quiz_id": quiz_id,
-        "time": quiz.time,
+        "time": rows[0].time,
         "questions": [
-            {"q": q.question, "options": q.options}
-            for q in questions
+            {"q": r.question, "options": r.options.split(OPTIONS_SEP)}
+            for r in rows
+            if r.question is not None
         ]
     })
 
@@ -213,7 +710,14 @@ def submit_quiz(quiz_id):
     name = data.get("name")
     answers = data.get("answers", {})
 
-    questions = Question.query.filter_by(quiz_id=quiz_id).all()
+    questions = (
+        db.session.query(
+            Question.question, Question.options, Question.answer_letter, Question.explanation
+        )
+        .filter_by(quiz_id=quiz_id)
+        .order_by(Question.id)   # same order as get_quiz, answers are keyed by index
+        .all()
+    )
 
     score = 0
     results = []
@@ -227,18 +731,19 @@ def submit_quiz(quiz_id):
 
         results.append({
             "question": q.question,
-            "options": q.options,
+            "options": q.options.split(OPTIONS_SEP),
             "selected": selected,
             "correct": correct,
             "isCorrect": is_correct,
             "explanation": q.explanation
         })
 
-    student = Student.query.filter_by(quiz_id=quiz_id, name=name).first()
-    if student:
-        student.score = score
-        student.finished = True
-        db.session.commit()
+    db.session.execute(
+        update(Student)
+        .where(Student.quiz_id == quiz_id, Student.name == name)
+        .values(score=score, finished=True)
+    )
+    db.session.commit()
 
     return jsonify({
         "score": score,
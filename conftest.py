@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# app.py connects to Groq and SQLite on import: give it a dummy key and a
+# throwaway database instead of the developer's quiz.db
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("QUIZ_DB_PATH", os.path.join(tempfile.mkdtemp(), "quiz.db"))
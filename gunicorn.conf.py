@@ -0,0 +1,13 @@
+import os
+
+# /api/generate spends most of its time waiting on Groq, so use threaded
+# workers: each worker process multiplexes many in-flight LLM calls instead
+# of pinning one process per request.
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+# exported so the forked workers size app.py's DB pool to match
+threads = int(os.environ.setdefault("GUNICORN_THREADS", "32"))
+
+# must stay above call_llm's 40s limit
+timeout = 60
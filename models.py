@@ -1,7 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 
-db = SQLAlchemy()
+# Objects keep their loaded state after commit; nothing here relies on
+# re-reading rows post-commit, so skip the implicit refresh SELECTs.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
+
+# Question.options holds the 4 choices joined by the ASCII unit separator
+OPTIONS_SEP = "\x1f"
 
 class Quiz(db.Model):
     __tablename__ = "quiz"
@@ -18,18 +23,43 @@ class Question(db.Model):
     __tablename__ = "question"
 
     id = db.Column(db.Integer, primary_key=True)
-    quiz_id = db.Column(db.String(10), db.ForeignKey("quiz.id"), nullable=False)
+    quiz_id = db.Column(db.String(10), db.ForeignKey("quiz.id"), nullable=False, index=True)
     question = db.Column(db.Text, nullable=False)
-    options = db.Column(db.JSON, nullable=False)
+    options = db.Column(db.Text, nullable=False)   # OPTIONS_SEP-joined
     answer_letter = db.Column(db.String(1), nullable=False)
     explanation = db.Column(db.Text)
 
 
 class Student(db.Model):
     __tablename__ = "student"
+    __table_args__ = (
+        db.Index("ix_student_quiz_name", "quiz_id", "name"),   # join_quiz / submit_quiz lookup
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     quiz_id = db.Column(db.String(10), db.ForeignKey("quiz.id"), nullable=False)
     score = db.Column(db.Integer, default=0)        # FIX
     finished = db.Column(db.Boolean, default=False)
+
+
+class LLMCache(db.Model):
+    __tablename__ = "llm_cache"
+
+    key = db.Column(db.String(64), primary_key=True)   # sha256 hex
+    response = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.Float, nullable=False)
+    last_used = db.Column(db.Float, nullable=False, index=True)
+
+
+class SemanticCache(db.Model):
+    __tablename__ = "semantic_cache"
+    # never reuse ids: workers track new rows by id > last seen id
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    num_q = db.Column(db.Integer, nullable=False)
+    embedding = db.Column(db.LargeBinary, nullable=False)   # float32, L2-normalized
+    response = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.Float, nullable=False, index=True)
+    last_used = db.Column(db.Float, nullable=False, index=True)
@@ -0,0 +1,75 @@
+import re
+
+import pytest
+
+from app import parse_mcqs
+
+
+def old_parse_mcqs(text):
+    """
+    The original block-split parser, kept as the reference behaviour
+    """
+    blocks = re.split(r"\n?(?=Q\d+:)", text)
+    mcqs = []
+
+    for b in blocks:
+        q = re.search(r"Q\d+:\s*(.*)", b)
+        opts = re.findall(r"\n([ABCD])\.\s*(.*)", b)
+        ans = re.search(r"Answer:\s*([ABCD])", b)
+        exp = re.search(r"Explanation:\s*(.*)", b)
+
+        if not q or len(opts) != 4 or not ans:
+            continue
+
+        mcqs.append({
+            "q": q.group(1).strip(),
+            "options": [o[1].strip() for o in opts],
+            "answer_letter": ans.group(1),
+            "explanation": exp.group(1).strip() if exp else ""
+        })
+
+    return mcqs
+
+
+SAME_AS_OLD = [
+    # plain, two questions
+    "Q1: What is X?\nA. one\nB. two\nC. three\nD. four\nAnswer: B\nExplanation: because\n\n"
+    "Q2: And Y?\nA. a\nB. b\nC. c\nD. d\nAnswer: D\nExplanation: so\n",
+    # preamble, no explanation, trailing spaces
+    "Here are your questions:\n\nQ1: Next?  \nA. a \nB. b\nC. c\nD. d\nAnswer: A\n",
+    # question text on the line after "Q1:"
+    "Q1:\nWhat?\nA. a\nB. b\nC. c\nD. d\nAnswer: C\nExplanation: e\n",
+    # incomplete question is skipped, the rest still parse
+    "Q1: bad\nA. x\nB. y\nAnswer: A\n"
+    "Q2: good\nA. 1\nB. 2\nC. 3\nD. 4\nAnswer: C\nExplanation: ok\n",
+    # answer with trailing text
+    "Q1: Pick\nA. a\nB. b\nC. c\nD. d\nAnswer: B) b\nExplanation: e\n",
+    # fifth option is ignored, A-D kept
+    "Q1: Pick\nA. a\nB. b\nC. c\nD. d\nE. e\nAnswer: D\nExplanation: x\n",
+    # explanation on the answer line
+    "Q1: Pick\nA. a\nB. b\nC. c\nD. d\nAnswer: B Explanation: x\n"
+    "Q2: More\nA. a\nB. b\nC. c\nD. d\nAnswer: C\n",
+    # refusal
+    "Sorry, I can't help with that.",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", SAME_AS_OLD)
+def test_matches_old_parser(text):
+    assert parse_mcqs(text) == old_parse_mcqs(text)
+
+
+def test_crlf_line_endings():
+    text = "Q1: What?\r\nA. a\r\nB. b\r\nC. c\r\nD. d\r\nAnswer: B\r\nExplanation: e\r\n"
+    assert parse_mcqs(text) == old_parse_mcqs(text.replace("\r\n", "\n"))
+
+
+def test_wrapped_question_keeps_all_lines():
+    text = "Q1: What is\nthe answer?\nA. a\nB. b\nC. c\nD. d\nAnswer: A\n"
+    assert parse_mcqs(text) == [{
+        "q": "What is the answer?",
+        "options": ["a", "b", "c", "d"],
+        "answer_letter": "A",
+        "explanation": ""
+    }]
@@ -0,0 +1,144 @@
+import hashlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import app as A  # noqa: E402
+from models import SemanticCache  # noqa: E402
+
+
+class StubEmbedding:
+    """
+    Bag-of-words stand-in for fastembed's TextEmbedding: identical texts
+    embed identically, texts with no words in common are orthogonal
+    """
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def embed(self, texts):
+        for t in texts:
+            vec = np.zeros(64, dtype=np.float32)
+            for word in t.split():
+                vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+            yield vec
+
+
+DOC_A = "photosynthesis converts light energy into chemical energy in plants"
+DOC_B = "the french revolution began in seventeen eighty nine"
+DOC_C = "binary search halves the sorted interval on every comparison"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(A, "np", np)
+    monkeypatch.setattr(A, "TextEmbedding", StubEmbedding)
+    monkeypatch.setattr(A, "_semantic", {
+        "embedder": StubEmbedding(A.SEMANTIC_CACHE_MODEL), "loader": None,
+        "last_id": 0, "synced": 0, "ids": [], "num_q": [], "matrix": None
+    })
+
+    with A.app.app_context():
+        SemanticCache.query.delete()
+        A.db.session.commit()
+        yield
+        A.db.session.rollback()
+
+
+def put(doc, response, num_q=5):
+    A.semantic_cache_put(A.semantic_embed(doc), num_q, response)
+
+
+def get(doc, num_q=5):
+    return A.semantic_cache_get(A.semantic_embed(doc), num_q)
+
+
+def test_hit(cache):
+    put(DOC_A, "RESPONSE_A")
+    assert get(DOC_A) == "RESPONSE_A"
+
+
+def test_miss(cache):
+    put(DOC_A, "RESPONSE_A")
+    assert get(DOC_B) is None
+
+
+def test_shared_preamble_is_not_a_hit(cache):
+    # same instructions block up front, different papers after it
+    preamble = " ".join(f"instruction{i}" for i in range(150))
+    paper_1 = preamble + " " + " ".join(f"alpha{i}" for i in range(600))
+    paper_2 = preamble + " " + " ".join(f"beta{i}" for i in range(600))
+
+    put(paper_1, "RESPONSE_1")
+    assert get(paper_1) == "RESPONSE_1"
+    assert get(paper_2) is None
+
+
+def test_num_q_mismatch(cache):
+    put(DOC_A, "RESPONSE_A", num_q=5)
+    assert get(DOC_A, num_q=3) is None
+
+
+def test_ttl_expiry(cache):
+    put(DOC_A, "RESPONSE_A")
+    SemanticCache.query.update({"created_at": 0.0})
+    A.db.session.commit()
+
+    assert get(DOC_A) is None
+    assert SemanticCache.query.count() == 0
+
+
+def test_lru_eviction(cache, monkeypatch):
+    monkeypatch.setattr(A, "SEMANTIC_CACHE_MAX_ROWS", 2)
+    clock = iter(range(1_000_000_000, 1_000_000_100))
+    monkeypatch.setattr(A.time, "time", lambda: float(next(clock)))
+
+    put(DOC_A, "RESPONSE_A")
+    put(DOC_B, "RESPONSE_B")
+    assert get(DOC_A) == "RESPONSE_A"    # A is now more recently used than B
+    put(DOC_C, "RESPONSE_C")
+
+    assert get(DOC_B) is None
+    assert get(DOC_A) == "RESPONSE_A"
+    assert get(DOC_C) == "RESPONSE_C"
+    assert len(A._semantic["ids"]) == 2
+
+
+def test_delete_then_insert_does_not_reuse_entry(cache):
+    put(DOC_A, "RESPONSE_A")
+    put(DOC_C, "RESPONSE_C")
+    assert get(DOC_C) == "RESPONSE_C"    # both rows now in the worker's matrix
+
+    SemanticCache.query.update({"created_at": 0.0})
+    A.db.session.commit()
+    assert get(DOC_C) is None            # expired, newest row deleted
+
+    put(DOC_B, "RESPONSE_B")
+    assert get(DOC_C) is None
+    assert get(DOC_B) == "RESPONSE_B"
+
+
+def test_eviction_pruned_after_dimension_change(cache):
+    # a row from another embedding model sits in the table
+    A.db.session.add(SemanticCache(
+        num_q=5, embedding=np.ones(8, dtype=np.float32).tobytes(),
+        response="OTHER_MODEL", created_at=A.time.time(), last_used=A.time.time()
+    ))
+    A.db.session.commit()
+
+    put(DOC_A, "RESPONSE_A")
+    assert get(DOC_A) == "RESPONSE_A"
+
+    SemanticCache.query.filter_by(response="RESPONSE_A").delete()
+    A.db.session.commit()
+    assert get(DOC_A) is None
+    assert A._semantic["ids"] == []
+
+
+def test_model_loads_lazily_in_background(cache):
+    A._semantic["embedder"] = None
+
+    assert A.semantic_embed(DOC_A) is None      # first call only starts the loader
+    A._semantic["loader"].join(timeout=5)
+    assert A.semantic_embed(DOC_A) is not None